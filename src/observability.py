@@ -1,20 +1,101 @@
 """Full observability platform - metrics, traces, and logs."""
 import sqlite3
+import threading
+import time
 import uuid
 import json
 from dataclasses import dataclass, asdict, field
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from pathlib import Path
 import argparse
+import copy
+from contextlib import contextmanager
+
+try:
+    import orjson
+except ImportError:  # optional C-accelerated encoder
+    orjson = None
 
 
 DB_PATH = Path.home() / ".blackroad" / "observability.db"
 
+# Bump when a column's storage format changes; older tables are migrated.
+SCHEMA_VERSION = 2
+
+_TABLES = ("metrics", "spans", "logs")
+
+# Write statements are kept textually identical so sqlite3's statement
+# cache reuses their prepared form across calls.
+_SQL_INS_METRIC = ("INSERT INTO metrics (id, name, value, labels, timestamp, type) "
+                   "VALUES (?, ?, ?, ?, ?, ?)")
+_SQL_INS_SPAN = ("INSERT INTO spans (trace_id, span_id, parent_span_id, service, operation, "
+                 "start_ts, end_ts, status, tags) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)")
+_SQL_UPD_SPAN = "UPDATE spans SET end_ts = ?, status = ?, tags = ? WHERE span_id = ?"
+_SQL_INS_LOG = ("INSERT INTO logs (id, service, level, message, timestamp, trace_id, fields) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)")
+
+# Rows fetched per lock acquisition when streaming query results
+_STREAM_CHUNK_SIZE = 256
+
+# How long a service_dashboard result is served from cache
+DASHBOARD_TTL_SECONDS = 5.0
+
 # Pre-defined BlackRoad services
 SERVICES = ["gateway", "worlds-worker", "dashboard-api", "agents-status", "fleet-manager"]
 
 
+def _json_dumps(obj: Any) -> str:
+    """Serialize with the stdlib in the compact, non-ASCII-escaped form orjson emits."""
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+if orjson is not None:
+    def _dumps(obj: Any) -> str:
+        """Serialize labels/tags/fields to a JSON string."""
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:  # values orjson rejects, e.g. integers wider than 64 bits
+            return _json_dumps(obj)
+else:
+    _dumps = _json_dumps
+
+
+def _to_micros(dt: datetime) -> int:
+    """Convert a datetime to integer epoch microseconds."""
+    return int(dt.timestamp() * 1_000_000)
+
+
+def _now_micros() -> int:
+    """Current time as integer epoch microseconds."""
+    return time.time_ns() // 1000
+
+
+def _legacy_micros(value: Any) -> Optional[int]:
+    """Migrate a stored timestamp (local-time ISO-8601 text) to epoch microseconds."""
+    if value is None or isinstance(value, int):
+        return value
+    try:
+        return _to_micros(datetime.fromisoformat(value))
+    except ValueError:
+        return None
+
+
+def _stored_id(value: Any) -> Optional[bytes]:
+    """Map an external ID (or a pre-BLOB TEXT ID) to its stored BLOB form.
+    
+    UUID strings become their 16 bytes; any other text is kept as UTF-8.
+    Writes, lookups and the legacy migration all use this, so a non-UUID
+    ID is stored and found the same way and an unknown ID matches nothing.
+    """
+    if value is None or isinstance(value, bytes):
+        return value
+    try:
+        return uuid.UUID(value).bytes
+    except ValueError:
+        return value.encode()
+
+
 @dataclass
 class Metric:
     """Observability metric."""
@@ -54,81 +135,218 @@ class ObservabilityPlatform:
     """Full observability platform."""
     
     def __init__(self):
+        # Re-entrant so a streaming cursor finalized mid-transaction can close
+        self._lock = threading.RLock()
+        self._dashboard_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
         self._init_db()
         self._populate_sample_data()
     
     def _init_db(self):
-        """Initialize SQLite database."""
+        """Initialize SQLite database and the shared connection."""
         DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-        with sqlite3.connect(DB_PATH) as conn:
-            conn.execute("""
+        # One long-lived autocommit connection; WAL + synchronous=NORMAL avoids
+        # an fsync per write while staying durable across application crashes.
+        self._conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
+        
+        # IMMEDIATE takes the write lock up front: a deferred transaction that
+        # reads user_version and then writes fails with SQLITE_BUSY under WAL
+        # when another connection starts at the same time, without waiting
+        # for busy_timeout.
+        with self._transaction(immediate=True):
+            # Timestamps are stored as INTEGER epoch microseconds and IDs as
+            # 16-byte UUID BLOBs (hex at the API boundary). Tables from an
+            # older schema are renamed aside and their rows copied over.
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            legacy = []
+            if version < SCHEMA_VERSION:
+                existing = {row[0] for row in self._conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'")}
+                legacy = [table for table in _TABLES if table in existing]
+                for table in legacy:
+                    self._conn.execute(f"ALTER TABLE {table} RENAME TO {table}_legacy")
+            
+            self._conn.execute("""
                 CREATE TABLE IF NOT EXISTS metrics (
-                    id TEXT PRIMARY KEY,
+                    id BLOB PRIMARY KEY,
                     name TEXT NOT NULL,
                     value REAL,
                     labels TEXT,
-                    timestamp TEXT,
+                    timestamp INTEGER,
                     type TEXT
                 )
             """)
-            conn.execute("""
+            self._conn.execute("""
                 CREATE TABLE IF NOT EXISTS spans (
-                    trace_id TEXT NOT NULL,
-                    span_id TEXT PRIMARY KEY,
-                    parent_span_id TEXT,
+                    trace_id BLOB NOT NULL,
+                    span_id BLOB PRIMARY KEY,
+                    parent_span_id BLOB,
                     service TEXT,
                     operation TEXT,
-                    start_ts TEXT,
-                    end_ts TEXT,
+                    start_ts INTEGER,
+                    end_ts INTEGER,
                     status TEXT,
                     tags TEXT
-                )
+                ) WITHOUT ROWID
             """)
-            conn.execute("""
+            self._conn.execute("""
                 CREATE TABLE IF NOT EXISTS logs (
-                    id TEXT PRIMARY KEY,
+                    id BLOB PRIMARY KEY,
                     service TEXT,
                     level TEXT,
                     message TEXT,
-                    timestamp TEXT,
-                    trace_id TEXT,
+                    timestamp INTEGER,
+                    trace_id BLOB,
                     fields TEXT
                 )
             """)
-            conn.commit()
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            """)
+            if legacy:
+                self._migrate_legacy(legacy)
+            
+            # Covers alert_rules' window scan, so it never touches the table
+            self._conn.execute("DROP INDEX IF EXISTS idx_metrics_ts_name")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_metrics_ts_name_value "
+                "ON metrics(timestamp, name, value)")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_metrics_name_ts ON metrics(name, timestamp DESC)")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_logs_svc_lvl_ts ON logs(service, level, timestamp)")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_spans_trace ON spans(trace_id, start_ts)")
+            if version < SCHEMA_VERSION:
+                self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    
+    def _migrate_legacy(self, tables: List[str]) -> None:
+        """Copy rows from renamed pre-SCHEMA_VERSION tables, then drop them."""
+        self._conn.create_function("legacy_us", 1, _legacy_micros, deterministic=True)
+        self._conn.create_function("legacy_id", 1, _stored_id, deterministic=True)
+        copies = {
+            "metrics": """
+                INSERT OR IGNORE INTO metrics (id, name, value, labels, timestamp, type)
+                SELECT legacy_id(id), name, value, labels, legacy_us(timestamp), type
+                FROM metrics_legacy
+            """,
+            "spans": """
+                INSERT OR IGNORE INTO spans (trace_id, span_id, parent_span_id, service,
+                                             operation, start_ts, end_ts, status, tags)
+                SELECT legacy_id(trace_id), legacy_id(span_id), legacy_id(parent_span_id),
+                       service, operation, legacy_us(start_ts), legacy_us(end_ts), status, tags
+                FROM spans_legacy
+            """,
+            "logs": """
+                INSERT OR IGNORE INTO logs (id, service, level, message, timestamp, trace_id, fields)
+                SELECT legacy_id(id), service, level, message, legacy_us(timestamp),
+                       legacy_id(trace_id), fields
+                FROM logs_legacy
+            """,
+        }
+        for table in tables:
+            self._conn.execute(copies[table])
+            self._conn.execute(f"DROP TABLE {table}_legacy")
+        # Databases from before the seed marker already hold their sample rows
+        if "metrics" in tables:
+            self._conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('seeded', '1')")
+    
+    @contextmanager
+    def _transaction(self, immediate: bool = False):
+        """Run a burst of statements in one explicit BEGIN/COMMIT.
+        
+        ``immediate`` takes the database write lock at BEGIN rather than at
+        the first write.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+    
+    def close(self) -> None:
+        """Close the shared database connection."""
+        with self._lock:
+            self._conn.close()
+    
+    def _stream(self, query: str, params: List[Any]) -> Iterator[tuple]:
+        """Yield result rows in chunks, holding the lock only while fetching."""
+        with self._lock:
+            cursor = self._conn.execute(query, params)
+        try:
+            while True:
+                with self._lock:
+                    rows = cursor.fetchmany(_STREAM_CHUNK_SIZE)
+                if not rows:
+                    return
+                yield from rows
+        finally:
+            with self._lock:
+                cursor.close()
     
     def _populate_sample_data(self):
-        """Populate sample data for BlackRoad services."""
-        # Add sample metrics for each service
+        """Populate sample data for BlackRoad services, once per database."""
+        batch = []
         for service in SERVICES:
-            self.record_metric(f"{service}.requests_per_minute", 
-                             150 + hash(service) % 100, 
-                             {"service": service}, "gauge")
-            self.record_metric(f"{service}.error_rate", 
-                             (hash(service) % 5) / 100.0, 
-                             {"service": service}, "gauge")
-            self.record_metric(f"{service}.p99_latency_ms", 
-                             100 + hash(service) % 200, 
-                             {"service": service}, "gauge")
+            labels = {"service": service}
+            batch.append({"name": f"{service}.requests_per_minute",
+                          "value": 150 + hash(service) % 100, "labels": labels})
+            batch.append({"name": f"{service}.error_rate",
+                          "value": (hash(service) % 5) / 100.0, "labels": labels})
+            batch.append({"name": f"{service}.p99_latency_ms",
+                          "value": 100 + hash(service) % 200, "labels": labels})
+        
+        with self._transaction() as conn:
+            # Claiming the marker first makes concurrent starts seed only once
+            claimed = conn.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES ('seeded', '1')").rowcount
+            if claimed:
+                conn.executemany(_SQL_INS_METRIC, self._metric_rows(batch)[1])
     
     def record_metric(self, name: str, value: float, labels: Dict[str, str] = None, 
                      type: str = "gauge") -> str:
         """Record a metric."""
-        if labels is None:
-            labels = {}
+        metric_id = uuid.uuid4().bytes
+        
+        with self._lock:
+            self._conn.execute(_SQL_INS_METRIC, (metric_id, name, value, _dumps(labels or {}),
+                                                 _now_micros(), type))
         
-        metric_id = str(uuid.uuid4())
-        metric = Metric(name=name, value=value, labels=labels, type=type)
+        return metric_id.hex()
+    
+    def record_metrics_batch(self, metrics: List[Dict[str, Any]]) -> List[str]:
+        """Record many metrics in one transaction.
         
-        with sqlite3.connect(DB_PATH) as conn:
-            conn.execute("""
-                INSERT INTO metrics (id, name, value, labels, timestamp, type)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (metric_id, metric.name, metric.value, json.dumps(metric.labels),
-                  metric.timestamp.isoformat(), metric.type))
-            conn.commit()
+        Each item takes the same keys as ``record_metric``: ``name``, ``value``
+        and optionally ``labels`` and ``type``.
+        """
+        metric_ids, rows = self._metric_rows(metrics)
+        with self._transaction() as conn:
+            conn.executemany(_SQL_INS_METRIC, rows)
         
-        return metric_id
+        return metric_ids
+    
+    def _metric_rows(self, metrics: List[Dict[str, Any]]) -> Tuple[List[str], List[tuple]]:
+        """Build hex IDs and insert parameters for a batch of metrics."""
+        now_us = _now_micros()
+        metric_ids = []
+        rows = []
+        for item in metrics:
+            metric_id = uuid.uuid4().bytes
+            metric_ids.append(metric_id.hex())
+            rows.append((metric_id, item["name"], item["value"], _dumps(item.get("labels") or {}),
+                         now_us, item.get("type", "gauge")))
+        return metric_ids, rows
     
     def increment(self, name: str, labels: Dict[str, str] = None) -> str:
         """Increment a counter metric."""
@@ -139,105 +357,96 @@ class ObservabilityPlatform:
     def start_span(self, service: str, operation: str, trace_id: str = None, 
                    parent_span_id: str = None) -> str:
         """Start a new span."""
-        if trace_id is None:
-            trace_id = str(uuid.uuid4())
-        
-        span_id = str(uuid.uuid4())
-        span = Span(trace_id=trace_id, span_id=span_id, parent_span_id=parent_span_id,
-                   service=service, operation=operation)
+        trace_key = uuid.uuid4().bytes if trace_id is None else _stored_id(trace_id)
+        span_key = uuid.uuid4().bytes
         
-        with sqlite3.connect(DB_PATH) as conn:
-            conn.execute("""
-                INSERT INTO spans (trace_id, span_id, parent_span_id, service, operation, 
-                                  start_ts, end_ts, status, tags)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (span.trace_id, span.span_id, span.parent_span_id, span.service, 
-                  span.operation, span.start_ts.isoformat(), None, span.status, "{}"))
-            conn.commit()
+        with self._lock:
+            self._conn.execute(_SQL_INS_SPAN, (trace_key, span_key, _stored_id(parent_span_id),
+                                                service, operation, _now_micros(), None, "ok", "{}"))
         
-        return span_id
+        return span_key.hex()
     
     def end_span(self, span_id: str, status: str = "ok", tags: Dict[str, str] = None) -> None:
         """End a span."""
         if tags is None:
             tags = {}
         
-        with sqlite3.connect(DB_PATH) as conn:
-            conn.execute("""
-                UPDATE spans SET end_ts = ?, status = ?, tags = ?
-                WHERE span_id = ?
-            """, (datetime.now().isoformat(), status, json.dumps(tags), span_id))
-            conn.commit()
+        with self._lock:
+            self._conn.execute(_SQL_UPD_SPAN, (_now_micros(), status, _dumps(tags),
+                                                _stored_id(span_id)))
     
     def log(self, service: str, level: str, message: str, trace_id: str = None, **fields) -> str:
         """Record a log entry."""
-        log_id = str(uuid.uuid4())
-        log_entry = LogEntry(service=service, level=level, message=message, 
-                            trace_id=trace_id, fields=fields)
+        log_id = uuid.uuid4().bytes
         
-        with sqlite3.connect(DB_PATH) as conn:
-            conn.execute("""
-                INSERT INTO logs (id, service, level, message, timestamp, trace_id, fields)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (log_id, log_entry.service, log_entry.level, log_entry.message,
-                  log_entry.timestamp.isoformat(), log_entry.trace_id, 
-                  json.dumps(log_entry.fields)))
-            conn.commit()
+        with self._lock:
+            self._conn.execute(_SQL_INS_LOG, (log_id, service, level, message, _now_micros(),
+                                               _stored_id(trace_id), _dumps(fields)))
         
-        return log_id
+        return log_id.hex()
     
     def get_metrics(self, name: str = None, labels: Dict[str, str] = None, 
-                   since_minutes: int = 60) -> List[Dict]:
-        """Query metrics."""
+                   since_minutes: int = 60) -> Iterator[Dict]:
+        """Query metrics, yielding rows as they are read."""
         if labels is None:
             labels = {}
         
-        cutoff = datetime.now() - timedelta(minutes=since_minutes)
+        # The upper bound pins the stream to rows that existed when it began;
+        # writes on the shared connection would otherwise show up mid-scan.
+        now_us = _now_micros()
+        cutoff_us = now_us - since_minutes * 60_000_000
         
-        query = "SELECT * FROM metrics WHERE timestamp > ?"
-        params = [cutoff.isoformat()]
+        query = ("SELECT id, name, value, labels, timestamp, type FROM metrics "
+                 "WHERE timestamp > ? AND timestamp <= ?")
+        params = [cutoff_us, now_us]
         
         if name:
             query += " AND name LIKE ?"
             params.append(f"%{name}%")
         
-        with sqlite3.connect(DB_PATH) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+        for r in self._stream(query, params):
+            yield {'id': r[0].hex(), 'name': r[1], 'value': r[2], 'labels': r[3],
+                   'timestamp': r[4], 'type': r[5]}
     
     def get_trace(self, trace_id: str) -> Dict[str, Any]:
         """Get full trace with all spans."""
-        with sqlite3.connect(DB_PATH) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute("""
-                SELECT * FROM spans WHERE trace_id = ?
+        trace_key = _stored_id(trace_id)
+        try:
+            trace_hex = uuid.UUID(trace_id).hex
+        except ValueError:
+            trace_hex = trace_id  # non-UUID IDs are echoed as passed in
+        with self._lock:
+            cursor = self._conn.execute("""
+                SELECT span_id, parent_span_id, service, operation, start_ts, end_ts, status, tags
+                FROM spans WHERE trace_id = ?
                 ORDER BY start_ts ASC
-            """, (trace_id,))
-            spans = [dict(row) for row in cursor.fetchall()]
+            """, (trace_key,))
+            rows = cursor.fetchall()
         
-        # Create waterfall view
-        waterfall = []
-        for span in spans:
-            start = datetime.fromisoformat(span['start_ts'])
-            end = datetime.fromisoformat(span['end_ts']) if span['end_ts'] else datetime.now()
-            duration_ms = (end - start).total_seconds() * 1000
-            waterfall.append({
-                'service': span['service'],
-                'operation': span['operation'],
-                'duration_ms': duration_ms,
-                'status': span['status']
-            })
+        spans = [{'trace_id': trace_hex, 'span_id': r[0].hex(),
+                  'parent_span_id': r[1].hex() if r[1] is not None else None,
+                  'service': r[2], 'operation': r[3], 'start_ts': r[4], 'end_ts': r[5],
+                  'status': r[6], 'tags': r[7]} for r in rows]
         
-        return {'trace_id': trace_id, 'spans': spans, 'waterfall': waterfall}
+        # Create waterfall view straight from the row tuples; open spans
+        # (end_ts NULL) run until now
+        now_us = _now_micros()
+        waterfall = [{'service': r[2], 'operation': r[3],
+                      'duration_ms': ((r[5] or now_us) - r[4]) / 1000.0, 'status': r[6]}
+                     for r in rows]
+        
+        return {'trace_id': trace_hex, 'spans': spans, 'waterfall': waterfall}
     
     def get_logs(self, service: str = None, level: str = None, 
-                 since_minutes: int = 60, limit: int = 100) -> List[Dict]:
-        """Query logs."""
-        cutoff = datetime.now() - timedelta(minutes=since_minutes)
+                 since_minutes: int = 60, limit: int = 100) -> Iterator[Dict]:
+        """Query logs, newest first, yielding rows as they are read."""
+        # Bounded above like get_metrics so the stream is a fixed snapshot
+        now_us = _now_micros()
+        cutoff_us = now_us - since_minutes * 60_000_000
         
-        query = "SELECT * FROM logs WHERE timestamp > ?"
-        params = [cutoff.isoformat()]
+        query = ("SELECT id, service, level, message, timestamp, trace_id, fields "
+                 "FROM logs WHERE timestamp > ? AND timestamp <= ?")
+        params = [cutoff_us, now_us]
         
         if service:
             query += " AND service = ?"
@@ -250,62 +459,71 @@ class ObservabilityPlatform:
         query += " ORDER BY timestamp DESC LIMIT ?"
         params.append(limit)
         
-        with sqlite3.connect(DB_PATH) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+        for r in self._stream(query, params):
+            yield {'id': r[0].hex(), 'service': r[1], 'level': r[2], 'message': r[3],
+                   'timestamp': r[4], 'trace_id': r[5].hex() if r[5] is not None else None,
+                   'fields': r[6]}
     
     def service_dashboard(self, service: str) -> Dict[str, Any]:
-        """Get service dashboard metrics."""
-        metrics = self.get_metrics(f"{service}", since_minutes=60)
-        logs = self.get_logs(service=service, level="error", since_minutes=60, limit=10)
+        """Get service dashboard metrics, cached for DASHBOARD_TTL_SECONDS."""
+        cached = self._dashboard_cache.get(service)
+        if cached is not None and time.monotonic() - cached[0] < DASHBOARD_TTL_SECONDS:
+            # Callers get their own copy so mutating a result can't alter the cache
+            return copy.deepcopy(cached[1])
+        
+        keys = {
+            f"{service}.requests_per_minute": 'requests_per_minute',
+            f"{service}.error_rate": 'error_rate',
+            f"{service}.p50_latency_ms": 'p50_latency',
+            f"{service}.p95_latency_ms": 'p95_latency',
+            f"{service}.p99_latency_ms": 'p99_latency',
+        }
+        cutoff_us = _now_micros() - 60 * 60_000_000
+        
+        # SQLite takes bare columns from the MAX() row, so this yields the
+        # latest value per metric name straight from idx_metrics_name_ts.
+        placeholders = ", ".join("?" * len(keys))
+        with self._lock:
+            cursor = self._conn.execute(f"""
+                SELECT name, value, MAX(timestamp) FROM metrics
+                WHERE name IN ({placeholders}) AND timestamp > ?
+                GROUP BY name
+            """, (*keys, cutoff_us))
+            latest = {row[0]: row[1] for row in cursor.fetchall()}
+        
+        logs = list(self.get_logs(service=service, level="error", since_minutes=60, limit=10))
         
         dashboard = {
             'service': service,
-            'metrics': {
-                'requests_per_minute': self._find_metric(metrics, f"{service}.requests_per_minute"),
-                'error_rate': self._find_metric(metrics, f"{service}.error_rate"),
-                'p50_latency': self._find_metric(metrics, f"{service}.p50_latency_ms"),
-                'p95_latency': self._find_metric(metrics, f"{service}.p95_latency_ms"),
-                'p99_latency': self._find_metric(metrics, f"{service}.p99_latency_ms"),
-            },
+            'metrics': {key: latest.get(name) for name, key in keys.items()},
             'recent_errors': logs
         }
         
+        now = time.monotonic()
+        for key, (cached_at, _) in list(self._dashboard_cache.items()):
+            if now - cached_at >= DASHBOARD_TTL_SECONDS:
+                self._dashboard_cache.pop(key, None)
+        self._dashboard_cache[service] = (now, copy.deepcopy(dashboard))
         return dashboard
     
-    def _find_metric(self, metrics: List[Dict], name: str) -> Optional[float]:
-        """Find metric value by name."""
-        for m in metrics:
-            if m['name'] == name:
-                return m['value']
-        return None
-    
     def alert_rules(self) -> List[Dict[str, Any]]:
         """Check metrics against thresholds and return violations."""
-        violations = []
-        metrics = self.get_metrics(since_minutes=5)
-        
-        for metric in metrics:
-            # Error rate > 5%
-            if 'error_rate' in metric['name'] and metric['value'] > 0.05:
-                violations.append({
-                    'metric': metric['name'],
-                    'value': metric['value'],
-                    'threshold': 0.05,
-                    'severity': 'high'
-                })
-            
-            # P99 latency > 500ms
-            if 'p99_latency' in metric['name'] and metric['value'] > 500:
-                violations.append({
-                    'metric': metric['name'],
-                    'value': metric['value'],
-                    'threshold': 500,
-                    'severity': 'medium'
-                })
+        cutoff_us = _now_micros() - 5 * 60_000_000
         
-        return violations
+        # Error rate > 5% (high), P99 latency > 500ms (medium). instr() is a
+        # case-sensitive literal substring test, unlike LIKE's '_' wildcard.
+        with self._lock:
+            cursor = self._conn.execute("""
+                SELECT name, value, 0.05, 'high'
+                FROM metrics
+                WHERE timestamp > ? AND instr(name, 'error_rate') > 0 AND value > 0.05
+                UNION ALL
+                SELECT name, value, 500, 'medium'
+                FROM metrics
+                WHERE timestamp > ? AND instr(name, 'p99_latency') > 0 AND value > 500
+            """, (cutoff_us, cutoff_us))
+            return [{'metric': r[0], 'value': r[1], 'threshold': r[2], 'severity': r[3]}
+                    for r in cursor.fetchall()]
 
 
 def main():
@@ -337,7 +555,8 @@ def main():
     elif args.command == "logs":
         logs = platform.get_logs(service=args.service, level=args.level)
         for log in logs:
-            print(f"[{log['timestamp']}] {log['service']} {log['level']}: {log['message']}")
+            ts = datetime.fromtimestamp(log['timestamp'] / 1_000_000).isoformat()
+            print(f"[{ts}] {log['service']} {log['level']}: {log['message']}")
 
 
 if __name__ == "__main__":
@@ -1,16 +1,224 @@
 """OpenTelemetry-compatible exporter stub."""
+import atexit
+import base64
+import gzip
 import json
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, List, Any, Optional
 from dataclasses import asdict
 
+try:
+    import orjson
+except ImportError:  # optional C-accelerated encoder
+    orjson = None
+
+try:
+    from google.protobuf.json_format import ParseDict, ParseError
+    from opentelemetry.proto.collector.logs.v1 import logs_service_pb2
+    from opentelemetry.proto.collector.metrics.v1 import metrics_service_pb2
+    from opentelemetry.proto.collector.trace.v1 import trace_service_pb2
+except ImportError:  # optional OTLP protobuf encoding
+    ParseDict = None
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize an OTLP payload to JSON bytes with the stdlib."""
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+if orjson is not None:
+    def _dumps(obj: Any) -> bytes:
+        """Serialize an OTLP payload to JSON bytes."""
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:  # values orjson rejects, e.g. integers wider than 64 bits
+            return _json_dumps(obj)
+else:
+    _dumps = _json_dumps
+
+
+if ParseDict is not None:
+    _PROTO_REQUESTS = {
+        "metrics": metrics_service_pb2.ExportMetricsServiceRequest,
+        "traces": trace_service_pb2.ExportTraceServiceRequest,
+        "logs": logs_service_pb2.ExportLogsServiceRequest,
+    }
+
+_PROTOBUF_HEADERS = {"Content-Type": "application/x-protobuf", "Content-Encoding": "gzip"}
+_HEX_ID_KEYS = ("traceId", "spanId", "parentSpanId")
+
+
+def _b64_ids(obj: Any) -> Any:
+    """Copy an OTLP/JSON payload with hex trace/span IDs re-encoded as base64.
+    
+    OTLP/JSON carries IDs as hex, while the protobuf JSON mapping used by
+    ParseDict expects base64 for bytes fields.
+    """
+    if isinstance(obj, dict):
+        return {k: (base64.b64encode(bytes.fromhex(v)).decode()
+                    if k in _HEX_ID_KEYS and isinstance(v, str) else _b64_ids(v))
+                for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_b64_ids(v) for v in obj]
+    return obj
+
+
+def _protobuf_body(payload: Dict[str, Any], kind: str) -> Optional[bytes]:
+    """Encode an OTLP/JSON payload as gzipped protobuf.
+    
+    Returns None when the payload does not map onto the OTLP schema (bad
+    values or fields the schema lacks), so the caller can send it as JSON
+    unchanged rather than drop or alter data.
+    """
+    try:
+        request = ParseDict(_b64_ids(payload), _PROTO_REQUESTS[kind]())
+    except (ParseError, ValueError, TypeError):
+        return None
+    return gzip.compress(request.SerializeToString(), compresslevel=6)
+
 
 class OTELExporter:
-    """OpenTelemetry-compatible exporter."""
+    """OpenTelemetry-compatible exporter.
     
-    def __init__(self, endpoint: str = "http://localhost:4318"):
+    Records passed to ``enqueue_*`` are sent by a background thread that
+    starts with the first enqueue. Call ``close()`` to flush them; an
+    ``atexit`` hook does so at interpreter exit for exporters left open.
+    """
+    
+    def __init__(self, endpoint: str = "http://localhost:4318", batch_size: int = 500,
+                 flush_interval: float = 0.1, max_queue_size: int = 10000,
+                 protobuf: bool = False):
         self.endpoint = endpoint
         self.timeout = 10
+        # Opt-in gzipped OTLP/protobuf (needs opentelemetry-proto): far fewer
+        # bytes on the wire, but converting the JSON-shaped records costs much
+        # more CPU than serializing them as JSON.
+        self.use_protobuf = protobuf and ParseDict is not None
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # Keep-alive connection pool shared by all exports
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._session.headers["Content-Type"] = "application/json"
+        # Metrics, traces and logs go to independent endpoints, so they
+        # are sent concurrently rather than one round-trip after another.
+        self._pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="otel-export")
+        
+        # Bounded queues shed the oldest records once full rather than
+        # blocking callers; a daemon thread drains them in batches.
+        self._queues = {kind: deque(maxlen=max_queue_size)
+                        for kind in ("metrics", "traces", "logs")}
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+    
+    def close(self) -> None:
+        """Flush queued records, stop the worker threads and close connections."""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._wakeup.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            atexit.unregister(self.close)
+        self.flush()
+        self._pool.shutdown()
+        self._session.close()
+    
+    def export_all(self, metrics: List[Dict[str, Any]] = None, spans: List[Dict[str, Any]] = None,
+                   logs: List[Dict[str, Any]] = None) -> Dict[str, bool]:
+        """Export metrics, traces and logs concurrently; returns success per kind."""
+        futures = {
+            "metrics": self._pool.submit(self.export_metrics, None, metrics),
+            "traces": self._pool.submit(self.export_traces, None, spans),
+            "logs": self._pool.submit(self.export_logs, None, logs),
+        }
+        wait(futures.values())
+        return {kind: future.result() for kind, future in futures.items()}
+    
+    def enqueue_metrics(self, metrics: List[Dict[str, Any]]) -> None:
+        """Queue metrics for batched export and return immediately."""
+        self._enqueue("metrics", metrics)
+    
+    def enqueue_traces(self, spans: List[Dict[str, Any]]) -> None:
+        """Queue spans for batched export and return immediately."""
+        self._enqueue("traces", spans)
+    
+    def enqueue_logs(self, logs: List[Dict[str, Any]]) -> None:
+        """Queue log records for batched export and return immediately."""
+        self._enqueue("logs", logs)
+    
+    def _enqueue(self, kind: str, records: List[Dict[str, Any]]) -> None:
+        if self._stopped.is_set():
+            raise RuntimeError("OTELExporter is closed")
+        if self._flusher is None:
+            self._start_flusher()
+        queue = self._queues[kind]
+        queue.extend(records)
+        if len(queue) >= self.batch_size:
+            self._wakeup.set()
+    
+    def _start_flusher(self) -> None:
+        """Start the flush thread on first use; synchronous callers never pay for it."""
+        with self._start_lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(target=self._flush_loop, name="otel-flush",
+                                             daemon=True)
+            self._flusher.start()
+            # Otherwise records still queued at interpreter exit would be lost
+            atexit.register(self.close)
+    
+    def _flush_loop(self) -> None:
+        """Flush every flush_interval, or sooner once a queue fills a batch."""
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+    
+    def flush(self) -> None:
+        """Export all queued records, one OTLP request per batch_size records."""
+        exports = (("metrics", self.export_metrics),
+                   ("traces", self.export_traces),
+                   ("logs", self.export_logs))
+        with self._flush_lock:
+            pending = [(self._queues[kind], export) for kind, export in exports
+                       if self._queues[kind]]
+            try:
+                wait([self._pool.submit(self._drain, queue, export)
+                      for queue, export in pending])
+            except RuntimeError:
+                # The pool refuses new work once interpreter shutdown begins
+                for queue, export in pending:
+                    self._drain(queue, export)
+    
+    def _drain(self, queue: deque, export) -> None:
+        """Export one queue in batch_size chunks until it is empty."""
+        while queue:
+            batch = [queue.popleft() for _ in range(min(self.batch_size, len(queue)))]
+            export(None, batch)
+    
+    def _post(self, url: str, payload: Dict[str, Any], kind: str) -> bool:
+        """POST an OTLP payload over the pooled session."""
+        body = _protobuf_body(payload, kind) if self.use_protobuf else None
+        if body is not None:
+            response = self._session.post(url, data=body, headers=_PROTOBUF_HEADERS,
+                                          timeout=self.timeout)
+            if response.status_code != 415:
+                return response.status_code == 200
+            # Collector does not accept protobuf; use JSON from now on
+            self.use_protobuf = False
+        
+        response = self._session.post(url, data=_dumps(payload), timeout=self.timeout)
+        return response.status_code == 200
     
     def export_metrics(self, endpoint: str = None, metrics: List[Dict[str, Any]] = None) -> bool:
         """Export metrics to OTLP HTTP endpoint."""
@@ -39,13 +247,7 @@ class OTELExporter:
         }
         
         try:
-            response = requests.post(
-                url,
-                json=payload,
-                headers={"Content-Type": "application/json"},
-                timeout=self.timeout
-            )
-            return response.status_code == 200
+            return self._post(url, payload, "metrics")
         except Exception as e:
             print(f"Failed to export metrics: {e}")
             return False
@@ -77,13 +279,7 @@ class OTELExporter:
         }
         
         try:
-            response = requests.post(
-                url,
-                json=payload,
-                headers={"Content-Type": "application/json"},
-                timeout=self.timeout
-            )
-            return response.status_code == 200
+            return self._post(url, payload, "traces")
         except Exception as e:
             print(f"Failed to export traces: {e}")
             return False
@@ -115,13 +311,7 @@ class OTELExporter:
         }
         
         try:
-            response = requests.post(
-                url,
-                json=payload,
-                headers={"Content-Type": "application/json"},
-                timeout=self.timeout
-            )
-            return response.status_code == 200
+            return self._post(url, payload, "logs")
         except Exception as e:
             print(f"Failed to export logs: {e}")
             return False